@@ -1,20 +1,599 @@
 import os
+import re
 import json
+import pickle
+import shelve
+import hashlib
 import logging
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+from typing import Any, Iterable, List, Dict, NamedTuple, Optional
 from pathlib import Path
 
 import numpy as np
-import pandas as pd
 import torch
+from torch.utils.data import DataLoader
 from tqdm import tqdm
-from sklearn.metrics import classification_report, accuracy_score, f1_score
-from transformers import pipeline
-from nltk.translate.bleu_score import sentence_bleu, SmoothingFunction
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import classification_report, confusion_matrix
+from transformers import AutoModelForSequenceClassification, AutoTokenizer, BitsAndBytesConfig
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+except ImportError:
+    ORTModelForSequenceClassification = None
+
+try:
+    from optimum.onnxruntime import ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+except ImportError:
+    ORTQuantizer = None
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+torch.set_float32_matmul_precision('high')
+torch.backends.cudnn.benchmark = True
+
+_SAMPLE_DATA = {
+    'en': [
+        {
+            'context': 'The quick brown fox jumps over the lazy dog.',
+            'question': 'What animal jumps over the dog?',
+            'answers': [{'text': 'fox'}],
+            'id': 'en_1'
+        },
+        {
+            'context': 'Neil Armstrong was the first person to walk on the moon in 1969.',
+            'question': 'Who was the first person to walk on the moon?',
+            'answers': [{'text': 'Neil Armstrong'}],
+            'id': 'en_2'
+        },
+        {
+            'context': 'The Nile is the longest river in the world, flowing through 11 countries in Africa.',
+            'question': 'What is the longest river in the world?',
+            'answers': [{'text': 'The Nile'}],
+            'id': 'en_3'
+        },
+        {
+            'context': 'Mount Everest is the tallest mountain in the world, standing at 8,848 meters.',
+            'question': 'What is the tallest mountain in the world?',
+            'answers': [{'text': 'Mount Everest'}],
+            'id': 'en_4'
+        },
+        {
+            'context': 'The Great Wall of China is one of the most famous landmarks in the world.',
+            'question': 'What is one of the most famous landmarks in China?',
+            'answers': [{'text': 'The Great Wall of China'}],
+            'id': 'en_5'
+        },
+        {
+            'context': 'The capital city of France is Paris, known for its art, fashion, and culture.',
+            'question': 'What is the capital city of France?',
+            'answers': [{'text': 'Paris'}],
+            'id': 'en_6'
+        },
+        {
+            'context': 'Shakespeare wrote the famous play Romeo and Juliet in the late 16th century.',
+            'question': 'Who wrote Romeo and Juliet?',
+            'answers': [{'text': 'Shakespeare'}],
+            'id': 'en_7'
+        },
+        {
+            'context': 'The Pacific Ocean is the largest and deepest ocean on Earth.',
+            'question': 'What is the largest ocean on Earth?',
+            'answers': [{'text': 'The Pacific Ocean'}],
+            'id': 'en_8'
+        },
+        {
+            'context': 'Thomas Edison invented the electric light bulb in 1879.',
+            'question': 'Who invented the electric light bulb?',
+            'answers': [{'text': 'Thomas Edison'}],
+            'id': 'en_9'
+        },
+        {
+            'context': 'The Mona Lisa, painted by Leonardo da Vinci, is one of the most famous artworks in history.',
+            'question': 'Who painted the Mona Lisa?',
+            'answers': [{'text': 'Leonardo da Vinci'}],
+            'id': 'en_10'
+        },
+        {
+            'context': 'The Sahara Desert is the largest hot desert in the world, located in Africa.',
+            'question': 'What is the largest hot desert in the world?',
+            'answers': [{'text': 'The Sahara Desert'}],
+            'id': 'en_11'
+        }
+    ],
+    'es': [
+        {
+            'context': 'El rápido zorro marrón salta sobre el perro perezoso.',
+            'question': '¿Qué animal salta sobre el perro?',
+            'answers': [{'text': 'zorro'}],
+            'id': 'es_1'
+        },
+        {
+            "context": "Cristóbal Colón zarpó en 1492 desde España y llegó al continente americano.",
+            "question": "¿En qué año llegó Cristóbal Colón a América?",
+            "answers": [{"text": "1492"}],
+            "id": "es_2"
+        },
+        {
+            "context": "La Torre Eiffel, uno de los monumentos más famosos del mundo, está ubicada en París.",
+            "question": "¿Dónde está ubicada la Torre Eiffel?",
+            "answers": [{"text": "París"}],
+            "id": "es_3"
+        },
+        {
+            "context": "El Amazonas es el río más largo del mundo y atraviesa varios países de América del Sur.",
+            "question": "¿Cuál es el río más largo del mundo?",
+            "answers": [{"text": "El Amazonas"}],
+            "id": "es_4"
+        },
+        {
+            "context": "La capital de Argentina es Buenos Aires, conocida por su rica cultura y tango.",
+            "question": "¿Cuál es la capital de Argentina?",
+            "answers": [{"text": "Buenos Aires"}],
+            "id": "es_5"
+        },
+        {
+            "context": "Miguel de Cervantes escribió Don Quijote, una de las obras más importantes de la literatura española.",
+            "question": "¿Quién escribió Don Quijote?",
+            "answers": [{"text": "Miguel de Cervantes"}],
+            "id": "es_6"
+        },
+        {
+            "context": "El Everest, con una altura de 8,848 metros, es la montaña más alta del mundo.",
+            "question": "¿Cuál es la montaña más alta del mundo?",
+            "answers": [{"text": "El Everest"}],
+            "id": "es_7"
+        },
+        {
+            "context": "El Real Madrid es uno de los equipos de fútbol más exitosos de Europa.",
+            "question": "¿Qué equipo de fútbol es uno de los más exitosos de Europa?",
+            "answers": [{"text": "Real Madrid"}],
+            "id": "es_8"
+        },
+        {
+            "context": "La Revolución Francesa comenzó en 1789 y marcó un cambio significativo en la historia de Europa.",
+            "question": "¿En qué año comenzó la Revolución Francesa?",
+            "answers": [{"text": "1789"}],
+            "id": "es_9"
+        },
+        {
+            "context": "Pablo Picasso fue un pintor y escultor español conocido por cofundar el movimiento cubista.",
+            "question": "¿Quién cofundó el movimiento cubista?",
+            "answers": [{"text": "Pablo Picasso"}],
+            "id": "es_10"
+        },
+        {
+            "context": "La Ópera de Sídney es uno de los edificios más emblemáticos de Australia.",
+            "question": "¿Cuál es uno de los edificios más emblemáticos de Australia?",
+            "answers": [{"text": "La Ópera de Sídney"}],
+            "id": "es_11"
+        },
+        {
+            'context': 'La Alhambra es un palacio histórico situado en Granada, España.',
+            'question': '¿Dónde se encuentra la Alhambra?',
+            'answers': [{'text': 'en Granada, España'}],
+            'id': 'es_12'
+        },
+    ],
+    'ru': [
+        {
+        "context": "Москва — столица России и крупнейший город страны.",
+        "question": "Какой город является столицей России?",
+        "answers": [{"text": "Москва"}],
+        "id": "ru_1"
+        },
+        {
+        "context": "Лев Толстой — известный русский писатель, автор «Войны и мира».",
+        "question": "Кто написал роман «Война и мир»?",
+        "answers": [{"text": "Лев Толстой"}],
+        "id": "ru_2"
+        },
+        {
+        "context": "Байкал — самое глубокое озеро в мире и расположено в России.",
+        "question": "Как называется самое глубокое озеро в мире?",
+        "answers": [{"text": "Байкал"}],
+        "id": "ru_3"
+        },
+        {
+        "context": "Юрий Гагарин стал первым человеком, полетевшим в космос в 1961 году.",
+        "question": "Кто был первым человеком в космосе?",
+        "answers": [{"text": "Юрий Гагарин"}],
+        "id": "ru_4"
+        },
+        {
+        "context": "Санкт-Петербург — второй по величине город в России, известный своими дворцами и каналами.",
+        "question": "Какой город в России известен своими дворцами и каналами?",
+        "answers": [{"text": "Санкт-Петербург"}],
+        "id": "ru_5"
+        },
+        {
+        "context": "Красная площадь — это главная площадь Москвы и всей России.",
+        "question": "Как называется главная площадь Москвы?",
+        "answers": [{"text": "Красная площадь"}],
+        "id": "ru_6"
+        },
+        {
+        "context": "Фёдор Достоевский написал роман «Преступление и наказание», который считается шедевром мировой литературы.",
+        "question": "Кто написал роман «Преступление и наказание»?",
+        "answers": [{"text": "Фёдор Достоевский"}],
+        "id": "ru_7"
+        },
+        {
+        "context": "Транссибирская магистраль — самая длинная железная дорога в мире, соединяющая Москву и Владивосток.",
+        "question": "Как называется самая длинная железная дорога в мире?",
+        "answers": [{"text": "Транссибирская магистраль"}],
+        "id": "ru_8"
+        },
+        {
+        "context": "Эрмитаж в Санкт-Петербурге — один из крупнейших и старейших музеев мира.",
+        "question": "Какой музей в Санкт-Петербурге является одним из крупнейших в мире?",
+        "answers": [{"text": "Эрмитаж"}],
+        "id": "ru_9"
+        },
+        {
+        "context": "Кремль в Москве — это резиденция президента России и символ страны.",
+        "question": "Что является резиденцией президента России?",
+        "answers": [{"text": "Кремль"}],
+        "id": "ru_10"
+        },
+        {
+            'context': 'Московский Кремль расположен в самом сердце Москвы.',
+            'question': 'Где расположен Московский Кремль?',
+            'answers': [{'text': 'в самом сердце Москвы'}],
+            'id': 'ru_11'
+        }
+    ],
+    'ar': [
+        {
+        "context": "الهرم الأكبر في الجيزة هو أحد عجائب الدنيا السبع القديمة.",
+        "question": "ما هو أحد عجائب الدنيا السبع القديمة في مصر؟",
+        "answers": [{"text": "الهرم الأكبر"}],
+        "id": "ar_1"
+        },
+        {
+        "context": "البتراء في الأردن مشهورة بمعمارها المنحوت في الصخور.",
+        "question": "ما هي المدينة الأردنية المشهورة بمعمارها المنحوت في الصخور؟",
+        "answers": [{"text": "البتراء"}],
+        "id": "ar_2"
+        },
+        {
+        "context": "قناة السويس تربط البحر الأحمر بالبحر الأبيض المتوسط.",
+        "question": "ما هي القناة التي تربط البحر الأحمر بالبحر الأبيض المتوسط؟",
+        "answers": [{"text": "قناة السويس"}],
+        "id": "ar_3"
+        },
+        {
+        "context": "ابن الهيثم كان عالماً مسلماً بارزاً في مجالات البصريات والرياضيات.",
+        "question": "من هو العالم المسلم البارز في مجال البصريات؟",
+        "answers": [{"text": "ابن الهيثم"}],
+        "id": "ar_4"
+        },
+        {
+        "context": "برج خليفة في دبي هو أطول مبنى في العالم.",
+        "question": "ما هو أطول مبنى في العالم؟",
+        "answers": [{"text": "برج خليفة"}],
+        "id": "ar_5"
+        },
+        {
+        "context": "صلاح الدين الأيوبي كان قائداً عسكرياً إسلامياً شهيراً.",
+        "question": "من هو القائد الإسلامي الشهير الذي حرر القدس؟",
+        "answers": [{"text": "صلاح الدين الأيوبي"}],
+        "id": "ar_6"
+        },
+        {
+        "context": "نهر النيل هو أطول نهر في العالم ويمر بعدة دول أفريقية.",
+        "question": "ما هو أطول نهر في العالم؟",
+        "answers": [{"text": "نهر النيل"}],
+        "id": "ar_7"
+        },
+        {
+        "context": "الكعبة في مكة المكرمة هي قبلة المسلمين.",
+        "question": "ما هي القبلة التي يتجه إليها المسلمون في صلاتهم؟",
+        "answers": [{"text": "الكعبة"}],
+        "id": "ar_8"
+        },
+        {
+        "context": "اللغة العربية هي واحدة من أكثر اللغات تحدثاً في العالم.",
+        "question": "ما هي اللغة التي تُعتبر من أكثر اللغات تحدثاً في العالم؟",
+        "answers": [{"text": "اللغة العربية"}],
+        "id": "ar_9"
+        },
+        {
+        "context": "الأهرامات في مصر تعد من أهم معالم السياحة في العالم.",
+        "question": "ما هي المعالم التي تعد من أهم معالم السياحة في مصر؟",
+        "answers": [{"text": "الأهرامات"}],
+        "id": "ar_10"
+        },
+        {
+            'context': 'تقع الأهرامات في مصر.',
+            'question': 'أين تقع الأهرامات؟',
+            'answers': [{'text': 'في مصر'}],
+            'id': 'ar_11'
+        }
+    ],
+    "de": [
+        {
+        "context": "Albert Einstein entwickelte die allgemeine Relativitätstheorie, die das Verständnis von Raum, Zeit und Gravitation revolutionierte.",
+        "question": "Wer entwickelte die allgemeine Relativitätstheorie?",
+        "answers": [{"text": "Albert Einstein"}],
+        "id": "de_2"
+        },
+        {
+        "context": "Die Berliner Mauer fiel am 9. November 1989 und markierte das Ende der Teilung Deutschlands.",
+        "question": "Wann fiel die Berliner Mauer?",
+        "answers": [{"text": "9. November 1989"}],
+        "id": "de_3"
+        },
+        {
+        "context": "Die Donau ist der zweitlängste Fluss Europas und fließt durch zehn Länder.",
+        "question": "Wie viele Länder durchfließt die Donau?",
+        "answers": [{"text": "zehn"}],
+        "id": "de_4"
+        },
+        {
+        "context": "Die Bundeskanzlerin von Deutschland im Jahr 2021 war Angela Merkel.",
+        "question": "Wer war die Bundeskanzlerin Deutschlands im Jahr 2021?",
+        "answers": [{"text": "Angela Merkel"}],
+        "id": "de_5"
+        },
+        {
+        "context": "Das Brandenburger Tor ist eines der bekanntesten Wahrzeichen Berlins.",
+        "question": "Was ist eines der bekanntesten Wahrzeichen Berlins?",
+        "answers": [{"text": "Das Brandenburger Tor"}],
+        "id": "de_6"
+        },
+        {
+        "context": "Johann Wolfgang von Goethe schrieb Faust, eines der bedeutendsten Werke der deutschen Literatur.",
+        "question": "Wer schrieb Faust?",
+        "answers": [{"text": "Johann Wolfgang von Goethe"}],
+        "id": "de_7"
+        },
+        {
+        "context": "Der Schwarzwald ist eine Region im Südwesten Deutschlands, bekannt für seine dichten Wälder und Kuckucksuhren.",
+        "question": "Wofür ist der Schwarzwald bekannt?",
+        "answers": [{"text": "dichte Wälder und Kuckucksuhren"}],
+        "id": "de_8"
+        },
+        {
+        "context": "Die deutsche Wiedervereinigung fand am 3. Oktober 1990 statt.",
+        "question": "Wann fand die deutsche Wiedervereinigung statt?",
+        "answers": [{"text": "3. Oktober 1990"}],
+        "id": "de_9"
+        },
+        {
+        "context": "Die Zugspitze ist der höchste Berg Deutschlands mit einer Höhe von 2.962 Metern.",
+        "question": "Wie hoch ist die Zugspitze?",
+        "answers": [{"text": "2.962 Meter"}],
+        "id": "de_10"
+        },
+        {
+        "context": "Die erste Buchdruckmaschine wurde von Johannes Gutenberg im 15. Jahrhundert entwickelt.",
+        "question": "Wer entwickelte die erste Buchdruckmaschine?",
+        "answers": [{"text": "Johannes Gutenberg"}],
+        "id": "de_11"
+        }
+    ],
+    "zh": [
+        {
+        "context": "长城是中国最著名的历史建筑之一，全长超过2万公里。",
+        "question": "中国最著名的历史建筑是什么？",
+        "answers": [{"text": "长城"}],
+        "id": "zh_1"
+        },
+        {
+        "context": "孔子是中国历史上著名的哲学家和教育家，被称为至圣先师。",
+        "question": "谁被称为至圣先师？",
+        "answers": [{"text": "孔子"}],
+        "id": "zh_2"
+        },
+        {
+        "context": "长江是中国最长的河流，也是世界第三长的河流。",
+        "question": "中国最长的河流是什么？",
+        "answers": [{"text": "长江"}],
+        "id": "zh_3"
+        },
+        {
+        "context": "故宫位于北京市中心，是明清两代的皇家宫殿。",
+        "question": "故宫位于哪里？",
+        "answers": [{"text": "北京市中心"}],
+        "id": "zh_4"
+        },
+        {
+        "context": "中国的国庆节是每年的10月1日。",
+        "question": "中国的国庆节是哪一天？",
+        "answers": [{"text": "10月1日"}],
+        "id": "zh_5"
+        },
+        {
+        "context": "四大发明是中国古代对世界文明的重要贡献，包括造纸术、印刷术、指南针和火药。",
+        "question": "四大发明包括什么？",
+        "answers": [{"text": "造纸术、印刷术、指南针和火药"}],
+        "id": "zh_6"
+        },
+        {
+        "context": "兵马俑被认为是秦始皇陵的陪葬品，是世界八大奇迹之一。",
+        "question": "兵马俑属于哪个历史人物的陪葬品？",
+        "answers": [{"text": "秦始皇"}],
+        "id": "zh_7"
+        },
+        {
+        "context": "北京奥运会于2008年在中国举行，是一场盛大的国际体育盛会。",
+        "question": "2008年奥运会在哪个国家举行？",
+        "answers": [{"text": "中国"}],
+        "id": "zh_8"
+        },
+        {
+        "context": "熊猫是中国的国宝，主要栖息在四川、陕西和甘肃的山区。",
+        "question": "熊猫主要栖息在哪里？",
+        "answers": [{"text": "四川、陕西和甘肃"}],
+        "id": "zh_9"
+        },
+        {
+        "context": "张艺谋是一位著名的中国导演，他执导了许多经典的电影。",
+        "question": "谁是著名的中国导演，执导了许多经典的电影？",
+        "answers": [{"text": "张艺谋"}],
+        "id": "zh_10"
+        }
+    ],
+    "tr": [
+        {
+        "context": "Ankara, Türkiye'nin başkenti ve ikinci en kalabalık şehridir.",
+        "question": "Türkiye'nin başkenti neresidir?",
+        "answers": [{"text": "Ankara"}],
+        "id": "tr_1"
+        },
+        {
+        "context": "Türkiye'nin en uzun nehri olan Kızılırmak, 1,355 kilometre uzunluğundadır.",
+        "question": "Türkiye'nin en uzun nehri hangisidir?",
+        "answers": [{"text": "Kızılırmak"}],
+        "id": "tr_2"
+        },
+        {
+        "context": "Atatürk, Türkiye Cumhuriyeti'nin kurucusudur ve ilk cumhurbaşkanıdır.",
+        "question": "Türkiye Cumhuriyeti'ni kim kurmuştur?",
+        "answers": [{"text": "Atatürk"}],
+        "id": "tr_3"
+        },
+        {
+        "context": "Pamukkale, travertenleri ve termal sularıyla ünlü bir doğa harikasıdır.",
+        "question": "Pamukkale neden ünlüdür?",
+        "answers": [{"text": "travertenleri ve termal sularıyla"}],
+        "id": "tr_4"
+        },
+        {
+        "context": "Türkiye'nin en büyük gölü olan Van Gölü, Doğu Anadolu Bölgesi'nde bulunur.",
+        "question": "Türkiye'nin en büyük gölü hangisidir?",
+        "answers": [{"text": "Van Gölü"}],
+        "id": "tr_5"
+        },
+        {
+        "context": "İstanbul Boğazı, Asya ve Avrupa kıtalarını birbirine bağlar.",
+        "question": "Asya ve Avrupa kıtalarını hangi boğaz birleştirir?",
+        "answers": [{"text": "İstanbul Boğazı"}],
+        "id": "tr_6"
+        },
+        {
+        "context": "Kapadokya, peri bacaları ve balon turlarıyla dünya çapında ünlüdür.",
+        "question": "Kapadokya neden ünlüdür?",
+        "answers": [{"text": "peri bacaları ve balon turlarıyla"}],
+        "id": "tr_7"
+        },
+        {
+        "context": "Efes Antik Kenti, UNESCO Dünya Mirası Listesi'nde yer alır ve Türkiye'nin önemli bir turistik alanıdır.",
+        "question": "Efes Antik Kenti nerede listelenmiştir?",
+        "answers": [{"text": "UNESCO Dünya Mirası Listesi"}],
+        "id": "tr_8"
+        },
+        {
+        "context": "Nemrut Dağı, devasa heykelleri ve tarihi kalıntılarıyla ünlüdür.",
+        "question": "Nemrut Dağı neden ünlüdür?",
+        "answers": [{"text": "devasa heykelleri ve tarihi kalıntılarıyla"}],
+        "id": "tr_9"
+        },
+        {
+        "context": "Mevlana, Konya'da yaşamış bir mutasavvıf ve Mevlevilik tarikatının kurucusudur.",
+        "question": "Mevlana kimdir?",
+        "answers": [{"text": "mutasavvıf ve Mevlevilik tarikatının kurucusu"}],
+        "id": "tr_10"
+        }
+    ]
+}
+
+class ZeroShotModel(NamedTuple):
+    model: Any
+    tokenizer: Any
+    entailment_id: int
+
+
+class EncodedPairs(NamedTuple):
+    order: np.ndarray
+    pair_indices: List[tuple]
+    collator: Any
+
+
+class PairCollator:
+    # Assembles padded NLI batches from cached token ids; kept standalone so DataLoader workers can pickle it
+    def __init__(self, tokenizer, template: List[tuple], premise_ids: List[List[int]], hypothesis_ids: List[List[int]],
+                 max_length: int, pad_to_multiple_of: Optional[int] = None):
+        self.tokenizer = tokenizer
+        self.template = template
+        self.premise_ids = premise_ids
+        self.hypothesis_ids = hypothesis_ids
+        self.max_length = max_length
+        self.pad_to_multiple_of = pad_to_multiple_of
+        self.with_token_types = 'token_type_ids' in tokenizer.model_input_names
+        self.num_special = sum(1 for _, sequence_id, _ in template if sequence_id is None)
+
+    def build_pair(self, premise_ids: List[int], hypothesis_ids: List[int]) -> Dict[str, List[int]]:
+        # Mirrors 'only_first' truncation: the question is shortened, never the hypothesis
+        premise_ids = premise_ids[:max(self.max_length - len(hypothesis_ids) - self.num_special, 0)]
+        sequences = (premise_ids, hypothesis_ids)
+        input_ids, token_type_ids = [], []
+        for token_id, sequence_id, token_type in self.template:
+            if sequence_id is None:
+                input_ids.append(token_id)
+                token_type_ids.append(token_type)
+            else:
+                input_ids.extend(sequences[sequence_id])
+                token_type_ids.extend([token_type] * len(sequences[sequence_id]))
+        pair = {'input_ids': input_ids}
+        if self.with_token_types:
+            pair['token_type_ids'] = token_type_ids
+        return pair
+
+    def __call__(self, indices: List[tuple]) -> Dict[str, torch.Tensor]:
+        pairs = [self.build_pair(self.premise_ids[question], self.hypothesis_ids[label]) for question, label in indices]
+        return dict(self.tokenizer.pad(pairs, pad_to_multiple_of=self.pad_to_multiple_of, return_tensors='pt'))
+
 
 class CrossLingualZeroShot:
-    def __init__(self, model_name: str = "MoritzLaurer/mDeBERTa-v3-base-mnli-xnli", models: Optional[List[str]] = None):
+    # Heuristic answer categories, in priority order (first match wins)
+    CATEGORY_PATTERNS = [
+        ('person', re.compile(r'who|person|people|name')),
+        ('location', re.compile(r'where|city|country|place')),
+        ('date', re.compile(r'when|year|month|time')),
+        ('number', re.compile(r'^[.,]*\d[\d.,]*\Z')),
+        ('organization', re.compile(r'company|organization|institution'))
+    ]
+
+    LABELS = ["person", "location", "organization", "date", "number", "description" , "sports", "politics", 
+              "technology", "science", "health", "history", "geography", "arts", "entertainment", "culture", "society", "economy", "business"]
+
+    # Loaded models keyed by (model path, loading options), shared by all instances
+    _MODEL_CACHE: Dict[tuple, Any] = {}
+
+    def __init__(
+        self,
+        model_name: str = "MoritzLaurer/mDeBERTa-v3-base-mnli-xnli",
+        models: Optional[List[str]] = None,
+        batch_size: int = 32,
+        backend: str = "torch",
+        quantize: bool = False,
+        compile_model: bool = False,
+        mode: str = "nli",
+        embedding_model: str = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2",
+        prediction_cache: Optional[str] = None,
+        num_workers: int = 0,
+        student_model: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
+        verbose: bool = False
+    ):
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        if self.device == "cuda":
+            self.torch_dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+        else:
+            self.torch_dtype = torch.float32
+            torch.set_num_threads(os.cpu_count() or 1)
         self.available_models = {
             "mDeBERTa": "MoritzLaurer/mDeBERTa-v3-base-mnli-xnli",
             "Multilingual_BERT": "emrecan/bert-base-multilingual-cased-snli_tr",
@@ -24,56 +603,182 @@ class CrossLingualZeroShot:
         }
         self.model_name = model_name
         self.models_to_use = models or list(self.available_models.values())
+        self.batch_size = batch_size
+        self.backend = backend
+        self.quantize = quantize
+        self.compile_model = compile_model
+        # Collation worker processes for the main single-model pass only; the ensemble (iterated from
+        # threads) and short inputs such as cache misses always collate in-process
+        self.num_workers = num_workers
+        # Progress bars are opt-in; by default batches are iterated without any per-update overhead
+        self.verbose = verbose
+        self._progress = tqdm if verbose else (lambda iterable, **kwargs: iterable)
+        self.mode = mode
+        self.embedding_model = embedding_model
+        self.student_model = student_model
+        self.student_head = None
+        # Optional on-disk cache of predictions, keyed by classifier setup, question and labels;
+        # the shelf is only opened while it is read or written, so no handle or lock outlives a call
+        self.prediction_cache = prediction_cache
+        self.onnx_cache_dir = Path.home() / ".cache" / "xnli_onnx"
+        self.max_length = 256
+        self.hypothesis_template = "This question is asking about {}."
+        self.classifiers = {}
+        self._tokenizer_keys = {}
+        self._hypothesis_cache = {}
+        self._streams = {}
         self.classifier = None
+        self.classifier_path = None
         self.supported_languages = [
             'en', 'es', 'de', 'ar', 'ru', 'zh', 'tr'
         ]
         self.setup_logging()
 
-    def load_model(self):
-        try:
-            for model_path in self.models_to_use:
+    def setup_logging(self):
+        self.logger = logging.getLogger(__name__)
+
+    def _load_onnx_model(self, model_path: str):
+        if ORTModelForSequenceClassification is None:
+            raise ImportError("The 'onnx' backend requires optimum[onnxruntime] to be installed")
+        provider = "CUDAExecutionProvider" if self.device == "cuda" else "CPUExecutionProvider"
+        # Export once and reuse the cached ONNX graph on later runs
+        export_dir = self.onnx_cache_dir / hashlib.sha1(model_path.encode('utf-8')).hexdigest()[:16]
+        # Check for the graph itself, not the directory, so an interrupted export is redone
+        if not (export_dir / "model.onnx").exists():
+            self.logger.info(f"Exporting {model_path} to ONNX in {export_dir}")
+            model = ORTModelForSequenceClassification.from_pretrained(model_path, export=True, provider=provider)
+            model.save_pretrained(export_dir)
+            if not self.quantize:
+                return model
+        if not self.quantize or self.device == "cuda":
+            if self.quantize:
+                self.logger.warning("ONNX INT8 quantization targets the CPU provider; using the unquantized graph on CUDA")
+            return ORTModelForSequenceClassification.from_pretrained(export_dir, provider=provider)
+        if ORTQuantizer is None:
+            raise ImportError("INT8 quantization of the 'onnx' backend requires a version of optimum with ORTQuantizer")
+        # Dynamic INT8 quantization of the exported graph, stored next to it as model_quantized.onnx
+        if not (export_dir / "model_quantized.onnx").exists():
+            self.logger.info(f"Quantizing {model_path} to INT8 in {export_dir}")
+            quantizer = ORTQuantizer.from_pretrained(export_dir, file_name="model.onnx")
+            quantizer.quantize(
+                save_dir=export_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            )
+        return ORTModelForSequenceClassification.from_pretrained(export_dir, file_name="model_quantized.onnx", provider=provider)
+
+    def _load_torch_model(self, model_path: str):
+        if self.quantize and self.device == "cuda":
+            # INT8 weights via bitsandbytes; the model cannot be moved after loading, so it is placed
+            # whole on the current GPU, where _entailment_scores sends the inputs
+            return AutoModelForSequenceClassification.from_pretrained(
+                model_path,
+                torch_dtype=self.torch_dtype,
+                quantization_config=BitsAndBytesConfig(load_in_8bit=True),
+                device_map={"": torch.cuda.current_device()}
+            ).eval()
+
+        model = AutoModelForSequenceClassification.from_pretrained(
+            model_path,
+            torch_dtype=self.torch_dtype
+        ).to(self.device).eval()
+        if self.quantize:
+            # On CPU, dynamic INT8 quantization of the linear layers uses the VNNI/AVX512 kernels
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        elif self.compile_model:
+            # CUDA graphs remove per-kernel launch overhead; batches are padded to a few fixed shapes
+            model = torch.compile(model, mode="reduce-overhead" if self.device == "cuda" else "default")
+        return model
+
+    def _entailment_id(self, model_path: str, model) -> int:
+        for label, label_id in model.config.label2id.items():
+            if label.lower().startswith("entail"):
+                return label_id
+        # Same fallback as the zero-shot pipeline (last logit), which is meaningless without an NLI head
+        self.logger.warning(f"{model_path} has no 'entailment' label; it is probably not an NLI model")
+        return -1
+
+    def _get_classifier(self, model_path: str) -> ZeroShotModel:
+        if model_path not in self.classifiers:
+            # Loaded models are shared across instances with the same loading options
+            cache_key = (model_path, self.backend, self.quantize, self.compile_model, self.device, self.torch_dtype)
+            if cache_key not in CrossLingualZeroShot._MODEL_CACHE:
                 self.logger.info(f"Loading model: {model_path}")
-                self.classifier = pipeline(
-                    "zero-shot-classification",
-                    model=model_path,
-                    device=0 if torch.cuda.is_available() else -1
-                )
+                tokenizer = AutoTokenizer.from_pretrained(model_path, use_fast=True)
+                if self.backend == "onnx":
+                    model = self._load_onnx_model(model_path)
+                else:
+                    model = self._load_torch_model(model_path)
+                CrossLingualZeroShot._MODEL_CACHE[cache_key] = ZeroShotModel(model, tokenizer, self._entailment_id(model_path, model))
+            self.classifiers[model_path] = CrossLingualZeroShot._MODEL_CACHE[cache_key]
+            if self.device == "cuda":
+                self._streams[model_path] = torch.cuda.Stream()
+        return self.classifiers[model_path]
+
+    def load_model(self, model_path: Optional[str] = None):
+        # Only load the model that is actually used; others are loaded on demand
+        try:
+            self.classifier_path = model_path or self.model_name
+            self.classifier = self._get_classifier(self.classifier_path)
             
-            self.logger.info(f"Loaded {len(self.classifier)} models successfully")
+            self.logger.info(f"Loaded {len(self.classifiers)} models successfully")
         except Exception as e:
             self.logger.error(f"Error loading models: {str(e)}")
             raise
 
-    def _evaluate_predictions(self, predictions: List[str], data: List[Dict]) -> Dict:
+    def _metrics_from_confusion(self, ground_truth: List[str], predictions: List[str]) -> Dict[str, float]:
+        labels = sorted(set(ground_truth) | set(predictions))
+        cm = confusion_matrix(ground_truth, predictions, labels=labels)
+        true_positives = np.diag(cm).astype(float)
+        support = cm.sum(axis=1)
+        predicted = cm.sum(axis=0)
+
+        # Same zero_division=0 convention as the sklearn metric functions
+        precision = np.divide(true_positives, predicted, out=np.zeros_like(true_positives), where=predicted > 0)
+        recall = np.divide(true_positives, support, out=np.zeros_like(true_positives), where=support > 0)
+        denominator = precision + recall
+        f1 = np.divide(2 * precision * recall, denominator, out=np.zeros_like(true_positives), where=denominator > 0)
+        weights = support / support.sum()
+
+        return {
+            'accuracy': float(true_positives.sum() / cm.sum()),
+            'f1_macro': float(f1.mean()),
+            'f1_weighted': float(f1 @ weights),
+            'precision': float(precision @ weights),
+            'recall': float(recall @ weights)
+        }
+
+    def _evaluate_predictions(self, predictions: List[str], data: List[Dict], include_full_report: bool = False) -> Dict:
+        # pandas is only needed here, so it is imported lazily to keep module import cheap
+        import pandas as pd
+
         try:
-            ground_truth = []
-            for item in data:
-                answer_text = item['answers'][0]['text'] if item['answers'] else "unknown"
-                if any(word in answer_text.lower() for word in ['who', 'person', 'people', 'name']):
-                    ground_truth.append('person')
-                elif any(word in answer_text.lower() for word in ['where', 'city', 'country', 'place']):
-                    ground_truth.append('location')
-                elif any(word in answer_text.lower() for word in ['when', 'year', 'month', 'time']):
-                    ground_truth.append('date')
-                elif answer_text.replace('.','').replace(',','').isdigit():
-                    ground_truth.append('number')
-                elif any(word in answer_text.lower() for word in ['company', 'organization', 'institution']):
-                    ground_truth.append('organization')
-                else:
-                    ground_truth.append('description')
+            answers = pd.Series(
+                [item['answers'][0]['text'] if item['answers'] else "unknown" for item in data],
+                dtype=object
+            )
+            # Answers repeat a lot ("unknown", numbers), so categorize each distinct text once
+            codes, unique_answers = pd.factorize(answers)
+            lowered = pd.Series(unique_answers, dtype=object).str.lower()
+            # Patterns run in priority order, each only over the answers not categorized yet
+            categories = np.full(len(lowered), 'description', dtype=object)
+            remaining = np.ones(len(lowered), dtype=bool)
+            for category, pattern in self.CATEGORY_PATTERNS:
+                if not remaining.any():
+                    break
+                candidates = np.flatnonzero(remaining)
+                matched = candidates[lowered.iloc[candidates].str.contains(pattern, regex=True).to_numpy(dtype=bool)]
+                categories[matched] = category
+                remaining[matched] = False
+            ground_truth = categories[codes].tolist()
 
             # Calculate metrics
-            metrics = {
-                'accuracy': accuracy_score(ground_truth, predictions),
-                'f1_macro': f1_score(ground_truth, predictions, average='macro'),
-                'f1_weighted': f1_score(ground_truth, predictions, average='weighted'),
-                'precision': precision_score(ground_truth, predictions, average='weighted'),
-                'recall': recall_score(ground_truth,predictions, average='weighted'),
-                'classification_report': classification_report(ground_truth, predictions, output_dict=True),
-                'predictions': predictions,
-                'ground_truth': ground_truth
-            }
+            metrics = self._metrics_from_confusion(ground_truth, predictions)
+            if include_full_report:
+                metrics['classification_report'] = classification_report(
+                    ground_truth, predictions, output_dict=True, zero_division=0
+                )
+            metrics['predictions'] = predictions
+            metrics['ground_truth'] = ground_truth
             
             self.logger.info(f"Evaluation completed. Accuracy: {metrics['accuracy']:.3f}")
             return metrics
@@ -90,26 +795,23 @@ class CrossLingualZeroShot:
         data_by_language = {}
         base_path = Path(base_path)
         
+        # List the directory once; per-language lookups are then set membership tests
+        present = {entry.name for entry in os.scandir(base_path) if entry.is_file()} if base_path.is_dir() else set()
+
         # Create sample data if no files are found
-        if not base_path.exists() or not any(base_path.glob("xquad*")):
+        if not any(name.startswith("xquad") for name in present):
             self.logger.warning(f"No data files found in {base_path}. Creating sample data...")
             return self.create_sample_data()
 
         for lang in self.supported_languages:
             try:
-                possible_files = [
-                    base_path / f"xquad-{lang}.json"
-                ]
-                
-                file_found = None
-                for file_path in possible_files:
-                    if file_path.exists():
-                        file_found = file_path
-                        break
+                file_name = f"xquad-{lang}.json"
+                file_found = base_path / file_name if file_name in present else None
                 
                 if file_found:
-                    with open(file_found, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
+                    with open(file_found, 'rb') as f:
+                        raw = f.read()
+                        data = orjson.loads(raw) if orjson else json.loads(raw)
                         processed_data = self._process_xquad_data(data)
                         data_by_language[lang] = processed_data
                         self.logger.info(f"Loaded {len(processed_data)} samples for {lang}")
@@ -127,489 +829,25 @@ class CrossLingualZeroShot:
         return data_by_language
 
     def create_sample_data(self) -> Dict[str, List]:
-        sample_data = {
-            'en': [
-                {
-                    'context': 'The quick brown fox jumps over the lazy dog.',
-                    'question': 'What animal jumps over the dog?',
-                    'answers': [{'text': 'fox'}],
-                    'id': 'en_1'
-                },
-                {
-                    'context': 'Neil Armstrong was the first person to walk on the moon in 1969.',
-                    'question': 'Who was the first person to walk on the moon?',
-                    'answers': [{'text': 'Neil Armstrong'}],
-                    'id': 'en_2'
-                },
-                {
-                    'context': 'The Nile is the longest river in the world, flowing through 11 countries in Africa.',
-                    'question': 'What is the longest river in the world?',
-                    'answers': [{'text': 'The Nile'}],
-                    'id': 'en_3'
-                },
-                {
-                    'context': 'Mount Everest is the tallest mountain in the world, standing at 8,848 meters.',
-                    'question': 'What is the tallest mountain in the world?',
-                    'answers': [{'text': 'Mount Everest'}],
-                    'id': 'en_4'
-                },
-                {
-                    'context': 'The Great Wall of China is one of the most famous landmarks in the world.',
-                    'question': 'What is one of the most famous landmarks in China?',
-                    'answers': [{'text': 'The Great Wall of China'}],
-                    'id': 'en_5'
-                },
-                {
-                    'context': 'The capital city of France is Paris, known for its art, fashion, and culture.',
-                    'question': 'What is the capital city of France?',
-                    'answers': [{'text': 'Paris'}],
-                    'id': 'en_6'
-                },
-                {
-                    'context': 'Shakespeare wrote the famous play Romeo and Juliet in the late 16th century.',
-                    'question': 'Who wrote Romeo and Juliet?',
-                    'answers': [{'text': 'Shakespeare'}],
-                    'id': 'en_7'
-                },
-                {
-                    'context': 'The Pacific Ocean is the largest and deepest ocean on Earth.',
-                    'question': 'What is the largest ocean on Earth?',
-                    'answers': [{'text': 'The Pacific Ocean'}],
-                    'id': 'en_8'
-                },
-                {
-                    'context': 'Thomas Edison invented the electric light bulb in 1879.',
-                    'question': 'Who invented the electric light bulb?',
-                    'answers': [{'text': 'Thomas Edison'}],
-                    'id': 'en_9'
-                },
-                {
-                    'context': 'The Mona Lisa, painted by Leonardo da Vinci, is one of the most famous artworks in history.',
-                    'question': 'Who painted the Mona Lisa?',
-                    'answers': [{'text': 'Leonardo da Vinci'}],
-                    'id': 'en_10'
-                },
-                {
-                    'context': 'The Sahara Desert is the largest hot desert in the world, located in Africa.',
-                    'question': 'What is the largest hot desert in the world?',
-                    'answers': [{'text': 'The Sahara Desert'}],
-                    'id': 'en_11'
-                }
-            ],
-            'es': [
-                {
-                    'context': 'El rápido zorro marrón salta sobre el perro perezoso.',
-                    'question': '¿Qué animal salta sobre el perro?',
-                    'answers': [{'text': 'zorro'}],
-                    'id': 'es_1'
-                },
-                {
-                    "context": "Cristóbal Colón zarpó en 1492 desde España y llegó al continente americano.",
-                    "question": "¿En qué año llegó Cristóbal Colón a América?",
-                    "answers": [{"text": "1492"}],
-                    "id": "es_2"
-                },
-                {
-                    "context": "La Torre Eiffel, uno de los monumentos más famosos del mundo, está ubicada en París.",
-                    "question": "¿Dónde está ubicada la Torre Eiffel?",
-                    "answers": [{"text": "París"}],
-                    "id": "es_3"
-                },
-                {
-                    "context": "El Amazonas es el río más largo del mundo y atraviesa varios países de América del Sur.",
-                    "question": "¿Cuál es el río más largo del mundo?",
-                    "answers": [{"text": "El Amazonas"}],
-                    "id": "es_4"
-                },
-                {
-                    "context": "La capital de Argentina es Buenos Aires, conocida por su rica cultura y tango.",
-                    "question": "¿Cuál es la capital de Argentina?",
-                    "answers": [{"text": "Buenos Aires"}],
-                    "id": "es_5"
-                },
-                {
-                    "context": "Miguel de Cervantes escribió Don Quijote, una de las obras más importantes de la literatura española.",
-                    "question": "¿Quién escribió Don Quijote?",
-                    "answers": [{"text": "Miguel de Cervantes"}],
-                    "id": "es_6"
-                },
-                {
-                    "context": "El Everest, con una altura de 8,848 metros, es la montaña más alta del mundo.",
-                    "question": "¿Cuál es la montaña más alta del mundo?",
-                    "answers": [{"text": "El Everest"}],
-                    "id": "es_7"
-                },
-                {
-                    "context": "El Real Madrid es uno de los equipos de fútbol más exitosos de Europa.",
-                    "question": "¿Qué equipo de fútbol es uno de los más exitosos de Europa?",
-                    "answers": [{"text": "Real Madrid"}],
-                    "id": "es_8"
-                },
-                {
-                    "context": "La Revolución Francesa comenzó en 1789 y marcó un cambio significativo en la historia de Europa.",
-                    "question": "¿En qué año comenzó la Revolución Francesa?",
-                    "answers": [{"text": "1789"}],
-                    "id": "es_9"
-                },
-                {
-                    "context": "Pablo Picasso fue un pintor y escultor español conocido por cofundar el movimiento cubista.",
-                    "question": "¿Quién cofundó el movimiento cubista?",
-                    "answers": [{"text": "Pablo Picasso"}],
-                    "id": "es_10"
-                },
-                {
-                    "context": "La Ópera de Sídney es uno de los edificios más emblemáticos de Australia.",
-                    "question": "¿Cuál es uno de los edificios más emblemáticos de Australia?",
-                    "answers": [{"text": "La Ópera de Sídney"}],
-                    "id": "es_11"
-                },
-                {
-                    'context': 'La Alhambra es un palacio histórico situado en Granada, España.',
-                    'question': '¿Dónde se encuentra la Alhambra?',
-                    'answers': [{'text': 'en Granada, España'}],
-                    'id': 'es_12'
-                },
-            ],
-            'ru': [
-                {
-                "context": "Москва — столица России и крупнейший город страны.",
-                "question": "Какой город является столицей России?",
-                "answers": [{"text": "Москва"}],
-                "id": "ru_1"
-                },
-                {
-                "context": "Лев Толстой — известный русский писатель, автор «Войны и мира».",
-                "question": "Кто написал роман «Война и мир»?",
-                "answers": [{"text": "Лев Толстой"}],
-                "id": "ru_2"
-                },
-                {
-                "context": "Байкал — самое глубокое озеро в мире и расположено в России.",
-                "question": "Как называется самое глубокое озеро в мире?",
-                "answers": [{"text": "Байкал"}],
-                "id": "ru_3"
-                },
-                {
-                "context": "Юрий Гагарин стал первым человеком, полетевшим в космос в 1961 году.",
-                "question": "Кто был первым человеком в космосе?",
-                "answers": [{"text": "Юрий Гагарин"}],
-                "id": "ru_4"
-                },
-                {
-                "context": "Санкт-Петербург — второй по величине город в России, известный своими дворцами и каналами.",
-                "question": "Какой город в России известен своими дворцами и каналами?",
-                "answers": [{"text": "Санкт-Петербург"}],
-                "id": "ru_5"
-                },
-                {
-                "context": "Красная площадь — это главная площадь Москвы и всей России.",
-                "question": "Как называется главная площадь Москвы?",
-                "answers": [{"text": "Красная площадь"}],
-                "id": "ru_6"
-                },
-                {
-                "context": "Фёдор Достоевский написал роман «Преступление и наказание», который считается шедевром мировой литературы.",
-                "question": "Кто написал роман «Преступление и наказание»?",
-                "answers": [{"text": "Фёдор Достоевский"}],
-                "id": "ru_7"
-                },
-                {
-                "context": "Транссибирская магистраль — самая длинная железная дорога в мире, соединяющая Москву и Владивосток.",
-                "question": "Как называется самая длинная железная дорога в мире?",
-                "answers": [{"text": "Транссибирская магистраль"}],
-                "id": "ru_8"
-                },
-                {
-                "context": "Эрмитаж в Санкт-Петербурге — один из крупнейших и старейших музеев мира.",
-                "question": "Какой музей в Санкт-Петербурге является одним из крупнейших в мире?",
-                "answers": [{"text": "Эрмитаж"}],
-                "id": "ru_9"
-                },
-                {
-                "context": "Кремль в Москве — это резиденция президента России и символ страны.",
-                "question": "Что является резиденцией президента России?",
-                "answers": [{"text": "Кремль"}],
-                "id": "ru_10"
-                },
-                {
-                    'context': 'Московский Кремль расположен в самом сердце Москвы.',
-                    'question': 'Где расположен Московский Кремль?',
-                    'answers': [{'text': 'в самом сердце Москвы'}],
-                    'id': 'ru_11'
-                }
-            ],
-            'ar': [
-                {
-                "context": "الهرم الأكبر في الجيزة هو أحد عجائب الدنيا السبع القديمة.",
-                "question": "ما هو أحد عجائب الدنيا السبع القديمة في مصر؟",
-                "answers": [{"text": "الهرم الأكبر"}],
-                "id": "ar_1"
-                },
-                {
-                "context": "البتراء في الأردن مشهورة بمعمارها المنحوت في الصخور.",
-                "question": "ما هي المدينة الأردنية المشهورة بمعمارها المنحوت في الصخور؟",
-                "answers": [{"text": "البتراء"}],
-                "id": "ar_2"
-                },
-                {
-                "context": "قناة السويس تربط البحر الأحمر بالبحر الأبيض المتوسط.",
-                "question": "ما هي القناة التي تربط البحر الأحمر بالبحر الأبيض المتوسط؟",
-                "answers": [{"text": "قناة السويس"}],
-                "id": "ar_3"
-                },
-                {
-                "context": "ابن الهيثم كان عالماً مسلماً بارزاً في مجالات البصريات والرياضيات.",
-                "question": "من هو العالم المسلم البارز في مجال البصريات؟",
-                "answers": [{"text": "ابن الهيثم"}],
-                "id": "ar_4"
-                },
-                {
-                "context": "برج خليفة في دبي هو أطول مبنى في العالم.",
-                "question": "ما هو أطول مبنى في العالم؟",
-                "answers": [{"text": "برج خليفة"}],
-                "id": "ar_5"
-                },
-                {
-                "context": "صلاح الدين الأيوبي كان قائداً عسكرياً إسلامياً شهيراً.",
-                "question": "من هو القائد الإسلامي الشهير الذي حرر القدس؟",
-                "answers": [{"text": "صلاح الدين الأيوبي"}],
-                "id": "ar_6"
-                },
-                {
-                "context": "نهر النيل هو أطول نهر في العالم ويمر بعدة دول أفريقية.",
-                "question": "ما هو أطول نهر في العالم؟",
-                "answers": [{"text": "نهر النيل"}],
-                "id": "ar_7"
-                },
-                {
-                "context": "الكعبة في مكة المكرمة هي قبلة المسلمين.",
-                "question": "ما هي القبلة التي يتجه إليها المسلمون في صلاتهم؟",
-                "answers": [{"text": "الكعبة"}],
-                "id": "ar_8"
-                },
-                {
-                "context": "اللغة العربية هي واحدة من أكثر اللغات تحدثاً في العالم.",
-                "question": "ما هي اللغة التي تُعتبر من أكثر اللغات تحدثاً في العالم؟",
-                "answers": [{"text": "اللغة العربية"}],
-                "id": "ar_9"
-                },
-                {
-                "context": "الأهرامات في مصر تعد من أهم معالم السياحة في العالم.",
-                "question": "ما هي المعالم التي تعد من أهم معالم السياحة في مصر؟",
-                "answers": [{"text": "الأهرامات"}],
-                "id": "ar_10"
-                },
-                {
-                    'context': 'تقع الأهرامات في مصر.',
-                    'question': 'أين تقع الأهرامات؟',
-                    'answers': [{'text': 'في مصر'}],
-                    'id': 'ar_11'
-                }
-            ],
-            "de": [
-                {
-                "context": "Albert Einstein entwickelte die allgemeine Relativitätstheorie, die das Verständnis von Raum, Zeit und Gravitation revolutionierte.",
-                "question": "Wer entwickelte die allgemeine Relativitätstheorie?",
-                "answers": [{"text": "Albert Einstein"}],
-                "id": "de_2"
-                },
-                {
-                "context": "Die Berliner Mauer fiel am 9. November 1989 und markierte das Ende der Teilung Deutschlands.",
-                "question": "Wann fiel die Berliner Mauer?",
-                "answers": [{"text": "9. November 1989"}],
-                "id": "de_3"
-                },
-                {
-                "context": "Die Donau ist der zweitlängste Fluss Europas und fließt durch zehn Länder.",
-                "question": "Wie viele Länder durchfließt die Donau?",
-                "answers": [{"text": "zehn"}],
-                "id": "de_4"
-                },
-                {
-                "context": "Die Bundeskanzlerin von Deutschland im Jahr 2021 war Angela Merkel.",
-                "question": "Wer war die Bundeskanzlerin Deutschlands im Jahr 2021?",
-                "answers": [{"text": "Angela Merkel"}],
-                "id": "de_5"
-                },
-                {
-                "context": "Das Brandenburger Tor ist eines der bekanntesten Wahrzeichen Berlins.",
-                "question": "Was ist eines der bekanntesten Wahrzeichen Berlins?",
-                "answers": [{"text": "Das Brandenburger Tor"}],
-                "id": "de_6"
-                },
-                {
-                "context": "Johann Wolfgang von Goethe schrieb Faust, eines der bedeutendsten Werke der deutschen Literatur.",
-                "question": "Wer schrieb Faust?",
-                "answers": [{"text": "Johann Wolfgang von Goethe"}],
-                "id": "de_7"
-                },
-                {
-                "context": "Der Schwarzwald ist eine Region im Südwesten Deutschlands, bekannt für seine dichten Wälder und Kuckucksuhren.",
-                "question": "Wofür ist der Schwarzwald bekannt?",
-                "answers": [{"text": "dichte Wälder und Kuckucksuhren"}],
-                "id": "de_8"
-                },
-                {
-                "context": "Die deutsche Wiedervereinigung fand am 3. Oktober 1990 statt.",
-                "question": "Wann fand die deutsche Wiedervereinigung statt?",
-                "answers": [{"text": "3. Oktober 1990"}],
-                "id": "de_9"
-                },
-                {
-                "context": "Die Zugspitze ist der höchste Berg Deutschlands mit einer Höhe von 2.962 Metern.",
-                "question": "Wie hoch ist die Zugspitze?",
-                "answers": [{"text": "2.962 Meter"}],
-                "id": "de_10"
-                },
-                {
-                "context": "Die erste Buchdruckmaschine wurde von Johannes Gutenberg im 15. Jahrhundert entwickelt.",
-                "question": "Wer entwickelte die erste Buchdruckmaschine?",
-                "answers": [{"text": "Johannes Gutenberg"}],
-                "id": "de_11"
-                }
-            ],
-            "zh": [
-                {
-                "context": "长城是中国最著名的历史建筑之一，全长超过2万公里。",
-                "question": "中国最著名的历史建筑是什么？",
-                "answers": [{"text": "长城"}],
-                "id": "zh_1"
-                },
-                {
-                "context": "孔子是中国历史上著名的哲学家和教育家，被称为至圣先师。",
-                "question": "谁被称为至圣先师？",
-                "answers": [{"text": "孔子"}],
-                "id": "zh_2"
-                },
-                {
-                "context": "长江是中国最长的河流，也是世界第三长的河流。",
-                "question": "中国最长的河流是什么？",
-                "answers": [{"text": "长江"}],
-                "id": "zh_3"
-                },
-                {
-                "context": "故宫位于北京市中心，是明清两代的皇家宫殿。",
-                "question": "故宫位于哪里？",
-                "answers": [{"text": "北京市中心"}],
-                "id": "zh_4"
-                },
-                {
-                "context": "中国的国庆节是每年的10月1日。",
-                "question": "中国的国庆节是哪一天？",
-                "answers": [{"text": "10月1日"}],
-                "id": "zh_5"
-                },
-                {
-                "context": "四大发明是中国古代对世界文明的重要贡献，包括造纸术、印刷术、指南针和火药。",
-                "question": "四大发明包括什么？",
-                "answers": [{"text": "造纸术、印刷术、指南针和火药"}],
-                "id": "zh_6"
-                },
-                {
-                "context": "兵马俑被认为是秦始皇陵的陪葬品，是世界八大奇迹之一。",
-                "question": "兵马俑属于哪个历史人物的陪葬品？",
-                "answers": [{"text": "秦始皇"}],
-                "id": "zh_7"
-                },
-                {
-                "context": "北京奥运会于2008年在中国举行，是一场盛大的国际体育盛会。",
-                "question": "2008年奥运会在哪个国家举行？",
-                "answers": [{"text": "中国"}],
-                "id": "zh_8"
-                },
-                {
-                "context": "熊猫是中国的国宝，主要栖息在四川、陕西和甘肃的山区。",
-                "question": "熊猫主要栖息在哪里？",
-                "answers": [{"text": "四川、陕西和甘肃"}],
-                "id": "zh_9"
-                },
-                {
-                "context": "张艺谋是一位著名的中国导演，他执导了许多经典的电影。",
-                "question": "谁是著名的中国导演，执导了许多经典的电影？",
-                "answers": [{"text": "张艺谋"}],
-                "id": "zh_10"
-                }
-            ],
-            "tr": [
-                {
-                "context": "Ankara, Türkiye'nin başkenti ve ikinci en kalabalık şehridir.",
-                "question": "Türkiye'nin başkenti neresidir?",
-                "answers": [{"text": "Ankara"}],
-                "id": "tr_1"
-                },
-                {
-                "context": "Türkiye'nin en uzun nehri olan Kızılırmak, 1,355 kilometre uzunluğundadır.",
-                "question": "Türkiye'nin en uzun nehri hangisidir?",
-                "answers": [{"text": "Kızılırmak"}],
-                "id": "tr_2"
-                },
-                {
-                "context": "Atatürk, Türkiye Cumhuriyeti'nin kurucusudur ve ilk cumhurbaşkanıdır.",
-                "question": "Türkiye Cumhuriyeti'ni kim kurmuştur?",
-                "answers": [{"text": "Atatürk"}],
-                "id": "tr_3"
-                },
-                {
-                "context": "Pamukkale, travertenleri ve termal sularıyla ünlü bir doğa harikasıdır.",
-                "question": "Pamukkale neden ünlüdür?",
-                "answers": [{"text": "travertenleri ve termal sularıyla"}],
-                "id": "tr_4"
-                },
-                {
-                "context": "Türkiye'nin en büyük gölü olan Van Gölü, Doğu Anadolu Bölgesi'nde bulunur.",
-                "question": "Türkiye'nin en büyük gölü hangisidir?",
-                "answers": [{"text": "Van Gölü"}],
-                "id": "tr_5"
-                },
-                {
-                "context": "İstanbul Boğazı, Asya ve Avrupa kıtalarını birbirine bağlar.",
-                "question": "Asya ve Avrupa kıtalarını hangi boğaz birleştirir?",
-                "answers": [{"text": "İstanbul Boğazı"}],
-                "id": "tr_6"
-                },
-                {
-                "context": "Kapadokya, peri bacaları ve balon turlarıyla dünya çapında ünlüdür.",
-                "question": "Kapadokya neden ünlüdür?",
-                "answers": [{"text": "peri bacaları ve balon turlarıyla"}],
-                "id": "tr_7"
-                },
-                {
-                "context": "Efes Antik Kenti, UNESCO Dünya Mirası Listesi'nde yer alır ve Türkiye'nin önemli bir turistik alanıdır.",
-                "question": "Efes Antik Kenti nerede listelenmiştir?",
-                "answers": [{"text": "UNESCO Dünya Mirası Listesi"}],
-                "id": "tr_8"
-                },
-                {
-                "context": "Nemrut Dağı, devasa heykelleri ve tarihi kalıntılarıyla ünlüdür.",
-                "question": "Nemrut Dağı neden ünlüdür?",
-                "answers": [{"text": "devasa heykelleri ve tarihi kalıntılarıyla"}],
-                "id": "tr_9"
-                },
-                {
-                "context": "Mevlana, Konya'da yaşamış bir mutasavvıf ve Mevlevilik tarikatının kurucusudur.",
-                "question": "Mevlana kimdir?",
-                "answers": [{"text": "mutasavvıf ve Mevlevilik tarikatının kurucusu"}],
-                "id": "tr_10"
-                }
-            ]
-        }
+        # Callers only slice the per-language lists, so the shared constant is returned as is
         self.logger.info("Created sample data for testing")
-        return sample_data
+        return _SAMPLE_DATA
 
     def _process_xquad_data(self, raw_data: Dict) -> List[Dict]:
         processed_data = []
         try:
             if 'data' in raw_data:
-                for article in raw_data['data']:
-                    for paragraph in article['paragraphs']:
-                        context = paragraph['context']
-                        for qa in paragraph['qas']:
-                            processed_data.append({
-                                'context': context,
-                                'question': qa['question'],
-                                'answers': qa['answers'],
-                                'id': qa['id']
-                            })
+                processed_data = [
+                    {
+                        'context': paragraph['context'],
+                        'question': qa['question'],
+                        'answers': qa['answers'],
+                        'id': qa['id']
+                    }
+                    for article in raw_data['data']
+                    for paragraph in article['paragraphs']
+                    for qa in paragraph['qas']
+                ]
             else:
                 self.logger.warning("Unexpected data format. Using raw data as is.")
                 processed_data = raw_data
@@ -624,10 +862,22 @@ class CrossLingualZeroShot:
         data_by_language: Dict[str, List],
         source_lang: str,
         target_langs: List[str],
-        sample_size: int = 100
+        sample_size: int = 100,
+        ensemble: bool = False,
+        include_full_report: bool = False
     ) -> Dict:
-        if not self.classifier:
-            self.load_model()
+        if self.mode == "embedding":
+            classify = self._classify_embedding
+        elif self.mode == "distilled":
+            classify = self._classify_distilled
+        elif ensemble:
+            classify = self._classify_ensemble
+        else:
+            if not self.classifier:
+                self.load_model()
+            classify = self._classify_batch
+        if self.prediction_cache:
+            classify = partial(self._classify_cached, classify, self._cache_scope(ensemble))
 
         results = {}
         
@@ -636,41 +886,349 @@ class CrossLingualZeroShot:
             raise ValueError(f"Source language '{source_lang}' not found in data. Available languages: {list(data_by_language.keys())}")
         
         # Prepare labels
-        labels = ["person", "location", "organization", "date", "number", "description" , "sports", "politics", 
-                  "technology", "science", "health", "history", "geography", "arts", "entertainment", "culture", "society", "economy", "business"]
+        labels = self.LABELS
         
-        # Process source language
-        self.logger.info(f"Processing source language: {source_lang}")
-        source_data = data_by_language[source_lang][:sample_size]
-        source_predictions = self._classify_batch(source_data, labels)
-        results[source_lang] = self._evaluate_predictions(source_predictions, source_data)
-
-        # Process target languages
+        samples = {source_lang: data_by_language[source_lang][:sample_size]}
         for target_lang in target_langs:
             if target_lang in data_by_language:
-                self.logger.info(f"Processing target language: {target_lang}")
-                target_data = data_by_language[target_lang][:sample_size]
-                target_predictions = self._classify_batch(target_data, labels)
-                results[target_lang] = self._evaluate_predictions(target_predictions, target_data)
+                samples[target_lang] = data_by_language[target_lang][:sample_size]
             else:
                 self.logger.warning(f"Target language '{target_lang}' not found in data. Skipping.")
 
+        # The models are multilingual, so all languages go through one length-sorted batched pass
+        self.logger.info(f"Processing languages: {', '.join(samples)}")
+        predictions = classify([item for lang_data in samples.values() for item in lang_data], labels)
+        # Items that could not be classified fall back to the first label
+        predictions = [labels[0] if prediction is None else prediction for prediction in predictions]
+
+        offset = 0
+        for lang, lang_data in samples.items():
+            results[lang] = self._evaluate_predictions(
+                predictions[offset:offset + len(lang_data)], lang_data, include_full_report=include_full_report
+            )
+            offset += len(lang_data)
+
         return results
 
-    def _classify_batch(self, data: List[Dict], labels: List[str]) -> List[str]:
-        predictions = []
-        for item in tqdm(data):
+    def _cache_scope(self, ensemble: bool) -> str:
+        # Everything that can change a prediction besides the question and labels
+        if self.mode == "embedding":
+            models = self.embedding_model
+        elif self.mode == "distilled":
+            # A re-distilled head must not reuse predictions from the previous one
+            head = self.student_head.coef_.tobytes() if self.student_head is not None else b""
+            models = f"{self.student_model}:{hashlib.blake2b(head, digest_size=8).hexdigest()}"
+        elif ensemble:
+            models = ",".join(self.models_to_use)
+        else:
+            models = self.classifier_path
+        return (
+            f"{self.mode}|{models}|{self.backend}|{self.quantize}|{self.compile_model}|{self.device}|{self.torch_dtype}|"
+            f"{self.hypothesis_template}|{self.max_length}"
+        )
+
+    def _classify_cached(self, classify, scope: str, data: List[Dict], labels: List[str]) -> List[Optional[str]]:
+        keys = [
+            hashlib.blake2b(f"{scope}|{item['question']}|{labels}".encode('utf-8'), digest_size=16).hexdigest()
+            for item in data
+        ]
+        with shelve.open(self.prediction_cache) as cache:
+            predictions = {i: cache[key] for i, key in enumerate(keys) if key in cache}
+        # Only questions without a cached prediction go to the model, as one batch
+        missing = [i for i in range(len(keys)) if i not in predictions]
+        if missing:
+            self.logger.info(f"Prediction cache: {len(predictions)} hits, {len(missing)} misses")
+            fresh = dict(zip(missing, classify([data[i] for i in missing], labels)))
+            # Failed items (None) are not stored, so they are retried on the next run
+            with shelve.open(self.prediction_cache) as cache:
+                for i, prediction in fresh.items():
+                    if prediction is not None:
+                        cache[keys[i]] = prediction
+            predictions.update(fresh)
+        return [predictions[i] for i in range(len(keys))]
+
+    def _tokenize_hypotheses(self, tokenizer, labels: List[str]) -> List[List[int]]:
+        return tokenizer(
+            [self.hypothesis_template.format(label) for label in labels],
+            add_special_tokens=False
+        )['input_ids']
+
+    def _hypothesis_encoding(self, tokenizer, labels: List[str]):
+        # Hypotheses and pair layout depend only on tokenizer and labels, so they are reused across languages
+        key = (id(tokenizer), self.hypothesis_template, tuple(labels))
+        if key not in self._hypothesis_cache:
+            self._hypothesis_cache[key] = (self._tokenize_hypotheses(tokenizer, labels), self._pair_template(tokenizer))
+        return self._hypothesis_cache[key]
+
+    def _pair_template(self, tokenizer) -> List[tuple]:
+        # Probe a dummy pair to learn where the model's special tokens go; works for any fast tokenizer
+        probe = tokenizer("a", "b", return_token_type_ids=True)
+        template = []
+        for position, sequence_id in enumerate(probe.sequence_ids()):
+            token_type = probe['token_type_ids'][position]
+            if sequence_id is None:
+                template.append((probe['input_ids'][position], None, token_type))
+            elif not template or template[-1][1] != sequence_id:
+                template.append((None, sequence_id, token_type))
+        return template
+
+    def _encode_pairs(self, tokenizer, questions: List[str], labels: List[str]) -> EncodedPairs:
+        # Each question and each hypothesis is tokenized once; pairs are assembled from ids
+        premise_ids = tokenizer(questions, add_special_tokens=False)['input_ids']
+        hypothesis_ids, template = self._hypothesis_encoding(tokenizer, labels)
+        collator = PairCollator(
+            tokenizer,
+            template,
+            premise_ids,
+            hypothesis_ids,
+            self.max_length,
+            pad_to_multiple_of=16 if self.compile_model else None
+        )
+
+        # Feed questions shortest-first so each batch pads to a similar length
+        order = np.argsort([len(ids) for ids in premise_ids], kind='stable')
+        pair_indices = [(int(i), label_idx) for i in order for label_idx in range(len(hypothesis_ids))]
+        return EncodedPairs(order, pair_indices, collator)
+
+    def _pair_batches(self, pairs: EncodedPairs, num_workers: int = 0) -> DataLoader:
+        # Forking workers only pays off when each of them has several batches to prefetch
+        if -(-len(pairs.pair_indices) // self.batch_size) < 4 * num_workers:
+            num_workers = 0
+        # Batches are assembled lazily (in worker processes when num_workers > 0) so collation
+        # overlaps with the forward passes; pinned memory allows asynchronous host-to-device copies
+        loader_kwargs = {'num_workers': num_workers, 'pin_memory': self.device == "cuda"}
+        if num_workers > 0:
+            loader_kwargs['prefetch_factor'] = 2
+        return DataLoader(pairs.pair_indices, batch_size=self.batch_size, shuffle=False, collate_fn=pairs.collator, **loader_kwargs)
+
+    def _entailment_scores(self, classifier: ZeroShotModel, pairs: EncodedPairs, batches: Iterable, num_labels: int) -> torch.Tensor:
+        copy_stream = torch.cuda.Stream() if self.device == "cuda" else None
+
+        def transfer(inputs):
+            if copy_stream is None:
+                return inputs
+            with torch.cuda.stream(copy_stream):
+                return {name: tensor.to(self.device, non_blocking=True) for name, tensor in inputs.items()}
+
+        def prefetch():
+            # A collation or copy error is returned and raised when that batch's turn comes
             try:
-                result = self.classifier(
-                    item['question'],
-                    labels,
-                    hypothesis_template="This question is asking about {}."
-                )
-                predictions.append(result['labels'][0])
+                return transfer(next(batch_iter))
+            except StopIteration:
+                return None
+            except Exception as e:
+                return e
+
+        def forward(inputs) -> torch.Tensor:
+            return classifier.model(**inputs).logits[:, classifier.entailment_id].float()
+
+        # Entailment logits in sorted pair order; questions that cannot be classified keep NaN
+        sorted_scores = torch.full((len(pairs.pair_indices),), float('nan'), device=self.device)
+
+        # Copy batch N+1 on a side stream while batch N runs on the default stream
+        batch_iter = iter(self._progress(batches, desc="Classifying", unit="batch", leave=False))
+        start = 0
+        next_inputs = prefetch()
+        while next_inputs is not None:
+            inputs = next_inputs
+            end = min(start + self.batch_size, len(pairs.pair_indices))
+            try:
+                if isinstance(inputs, Exception):
+                    raise inputs
+                if copy_stream is not None:
+                    compute_stream = torch.cuda.current_stream()
+                    compute_stream.wait_stream(copy_stream)
+                    for tensor in inputs.values():
+                        tensor.record_stream(compute_stream)
+                # Copied out right away, before a compiled model's next CUDA-graph replay overwrites the logits
+                sorted_scores[start:end] = forward(inputs)
             except Exception as e:
-                self.logger.error(f"Error classifying item: {str(e)}")
-                predictions.append(labels[0])  
-        return predictions
+                # Retry only the questions in the failing batch, one question (all its labels) at a time
+                self.logger.error(f"Error classifying batch, retrying its questions individually: {str(e)}")
+                for rank in range(start // num_labels, (end - 1) // num_labels + 1):
+                    block = slice(rank * num_labels, (rank + 1) * num_labels)
+                    try:
+                        question_inputs = pairs.collator(pairs.pair_indices[block])
+                        sorted_scores[block] = forward({name: tensor.to(self.device) for name, tensor in question_inputs.items()})
+                    except Exception as e:
+                        sorted_scores[block] = float('nan')
+                        self.logger.error(f"Error classifying item: {str(e)}")
+            # The forward is queued asynchronously on CUDA, so the next batch is collated and copied meanwhile
+            next_inputs = prefetch()
+            start = end
+
+        # Results stay on the device until here, so there is a single sync point
+        sorted_scores = sorted_scores.cpu().view(len(pairs.order), num_labels)
+        scores = torch.empty_like(sorted_scores)
+        scores[torch.as_tensor(pairs.order)] = sorted_scores
+        return scores
+
+    def _labels_from_scores(self, scores: torch.Tensor, labels: List[str]) -> List[Optional[str]]:
+        # Rows with NaN scores could not be classified and are reported as None
+        failed = scores.isnan().any(dim=1).tolist()
+        return [None if bad else labels[label_idx] for bad, label_idx in zip(failed, scores.argmax(dim=1).tolist())]
+
+    @torch.inference_mode()
+    def _classify_batch(self, data: List[Dict], labels: List[str]) -> List[Optional[str]]:
+        if not data:
+            return []
+        questions = [item['question'] for item in data]
+        try:
+            pairs = self._encode_pairs(self.classifier.tokenizer, questions, labels)
+            scores = self._entailment_scores(self.classifier, pairs, self._pair_batches(pairs, self.num_workers), len(labels))
+            # Single-label zero-shot: the best label has the highest entailment logit
+            return self._labels_from_scores(scores, labels)
+        except Exception as e:
+            self.logger.error(f"Error classifying batch: {str(e)}")
+            return [None] * len(data)
+
+    def _tokenizer_key(self, model_path: str, tokenizer) -> str:
+        if model_path not in self._tokenizer_keys:
+            vocab = json.dumps(sorted(tokenizer.get_vocab().items()), ensure_ascii=False)
+            self._tokenizer_keys[model_path] = f"{type(tokenizer).__name__}:{hashlib.sha1(vocab.encode('utf-8')).hexdigest()}"
+        return self._tokenizer_keys[model_path]
+
+    def _ensemble_member_probabilities(self, model_path: str, classifier: ZeroShotModel, pairs: EncodedPairs, batches: Iterable, num_labels: int) -> torch.Tensor:
+        # inference_mode and the current CUDA stream are thread-local, so each worker sets its own
+        stream = self._streams.get(model_path)
+        with torch.inference_mode(), (torch.cuda.stream(stream) if stream is not None else nullcontext()):
+            return self._entailment_scores(classifier, pairs, batches, num_labels).softmax(dim=1)
+
+    @torch.inference_mode()
+    def _classify_ensemble(self, data: List[Dict], labels: List[str]) -> List[Optional[str]]:
+        if not data:
+            return []
+        questions = [item['question'] for item in data]
+        try:
+            # Models with an identical tokenizer (e.g. XLM-R and InfoXLM) share one encoding of the pairs
+            groups = {}
+            for model_path in self.models_to_use:
+                classifier = self._get_classifier(model_path)
+                if classifier.entailment_id < 0:
+                    self.logger.warning(f"Leaving {model_path} out of the ensemble: it has no entailment label")
+                    continue
+                groups.setdefault(self._tokenizer_key(model_path, classifier.tokenizer), []).append((model_path, classifier))
+            if not groups:
+                raise ValueError("None of the ensemble models has an entailment label")
+
+            jobs = []
+            for members in groups.values():
+                pairs = self._encode_pairs(members[0][1].tokenizer, questions, labels)
+                batches = self._pair_batches(pairs)
+                if len(members) > 1:
+                    # Collate once and let every member of the group reuse the same batches
+                    batches = list(batches)
+                jobs.extend((model_path, classifier, pairs, batches) for model_path, classifier in members)
+
+            # On CUDA each model runs on its own stream so independent forwards overlap;
+            # on CPU the intra-op thread pool is already saturated, so members run one at a time
+            max_workers = len(jobs) if self.device == "cuda" else 1
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(self._ensemble_member_probabilities, *job, len(labels))
+                    for job in jobs
+                ]
+                probabilities = sum(future.result() for future in futures)
+            # A question that failed for any member has NaN probabilities and is not voted on
+            return self._labels_from_scores(probabilities, labels)
+        except Exception as e:
+            self.logger.error(f"Error classifying batch with ensemble: {str(e)}")
+            return [None] * len(data)
+
+    def _get_embedder(self, model_name: Optional[str] = None):
+        model_name = model_name or self.embedding_model
+        cache_key = ("embedding", model_name, self.device, self.torch_dtype)
+        if cache_key not in CrossLingualZeroShot._MODEL_CACHE:
+            if SentenceTransformer is None:
+                raise ImportError("The 'embedding' and 'distilled' modes require sentence-transformers to be installed")
+            self.logger.info(f"Loading embedding model: {model_name}")
+            embedder = SentenceTransformer(model_name, device=self.device)
+            # Same precision policy as the NLI models: BF16/FP16 on CUDA, FP32 on CPU
+            embedder.to(self.torch_dtype)
+            CrossLingualZeroShot._MODEL_CACHE[cache_key] = embedder
+        return CrossLingualZeroShot._MODEL_CACHE[cache_key]
+
+    @torch.inference_mode()
+    def _classify_embedding(self, data: List[Dict], labels: List[str]) -> List[Optional[str]]:
+        if not data:
+            return []
+        try:
+            embedder = self._get_embedder()
+            # One encoder pass per question instead of one NLI pass per (question, label) pair
+            question_embeddings = embedder.encode(
+                [item['question'] for item in data],
+                batch_size=64,
+                show_progress_bar=self.verbose,
+                convert_to_tensor=True,
+                normalize_embeddings=True
+            )
+            label_embeddings = embedder.encode(
+                [self.hypothesis_template.format(label) for label in labels],
+                convert_to_tensor=True,
+                normalize_embeddings=True
+            )
+            # Embeddings are unit-normalized, so the dot product is the cosine similarity
+            scores = question_embeddings @ label_embeddings.T
+            return [labels[label_idx] for label_idx in scores.argmax(dim=1).tolist()]
+        except Exception as e:
+            self.logger.error(f"Error classifying batch with embeddings: {str(e)}")
+            return [None] * len(data)
+
+    @torch.inference_mode()
+    def _student_features(self, data: List[Dict]) -> np.ndarray:
+        student = self._get_embedder(self.student_model)
+        embeddings = student.encode(
+            [item['question'] for item in data],
+            batch_size=64,
+            show_progress_bar=self.verbose,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+        return np.asarray(embeddings, dtype=np.float32)
+
+    def distill(self, data: List[Dict], labels: Optional[List[str]] = None, ensemble: bool = False, save_path: Optional[str] = None):
+        labels = labels or self.LABELS
+        # The NLI teacher labels the questions once; afterwards only the small student encoder runs
+        if ensemble:
+            pseudo_labels = self._classify_ensemble(data, labels)
+        else:
+            if not self.classifier:
+                self.load_model()
+            pseudo_labels = self._classify_batch(data, labels)
+        self.logger.info(f"Distilling {len(data)} pseudo-labelled questions into {self.student_model}")
+        # Questions the teacher could not classify are left out of the training set
+        kept = [i for i, label in enumerate(pseudo_labels) if label is not None]
+        if not kept:
+            raise ValueError("Cannot distill: the teacher could not classify any of the questions")
+        if len({pseudo_labels[i] for i in kept}) < 2:
+            raise ValueError(f"Cannot distill: the teacher predicted a single label ('{pseudo_labels[kept[0]]}') for every question")
+        self.student_head = LogisticRegression(max_iter=1000).fit(
+            self._student_features([data[i] for i in kept]),
+            [pseudo_labels[i] for i in kept]
+        )
+        if save_path:
+            with open(save_path, 'wb') as f:
+                pickle.dump({'student_model': self.student_model, 'head': self.student_head}, f)
+
+    def load_student(self, path: str):
+        with open(path, 'rb') as f:
+            student = pickle.load(f)
+        self.student_model = student['student_model']
+        self.student_head = student['head']
+
+    def _classify_distilled(self, data: List[Dict], labels: List[str]) -> List[Optional[str]]:
+        if not data:
+            return []
+        if self.student_head is None:
+            raise ValueError("The 'distilled' mode requires distill() or load_student() to be called first")
+        missing = set(labels) - set(self.student_head.classes_)
+        if missing:
+            self.logger.warning(f"Labels never predicted by the teacher during distillation: {sorted(missing)}")
+        try:
+            return self.student_head.predict(self._student_features(data)).tolist()
+        except Exception as e:
+            self.logger.error(f"Error classifying batch with the distilled model: {str(e)}")
+            return [None] * len(data)
 
 def main():
     classifier = CrossLingualZeroShot()
@@ -694,14 +1252,10 @@ def main():
         
         for lang, lang_results in results.items():
             print(f"\nResults for {lang}:")
-            if 'classification_report' in lang_results:
-                metrics = lang_results['classification_report']
-                if isinstance(metrics, dict) and 'weighted avg' in metrics:
-                    print(f"Weighted F1-score: {metrics['weighted avg']['f1-score']:.3f}")
-                else:
-                    print("Metrics format unexpected")
+            if 'f1_weighted' in lang_results:
+                print(f"Weighted F1-score: {lang_results['f1_weighted']:.3f}")
             else:
-                print("No classification report available")
+                print("No metrics available")
 
     except Exception as e:
         print(f"An error occurred: {str(e)}")